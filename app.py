@@ -13,12 +13,19 @@ All CSV edits are saved as new versioned files to maintain data integrity.
 
 import streamlit as st
 import pandas as pd
+from google.auth.transport.requests import AuthorizedSession
 from google.oauth2 import service_account
+from google_auth_httplib2 import AuthorizedHttp
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaFileUpload
-import io
+from googleapiclient.errors import HttpError
+from googleapiclient.http import MediaIoBaseUpload, build_http
+import queue
+import re
+import tempfile
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from requests.adapters import HTTPAdapter
 
 # ============================================================================
 # CONFIGURATION
@@ -38,10 +45,71 @@ CSV_FILENAME = "part4_nightsummary_sleep_cleaned.csv"
 PDF_FILENAME_1 = "visualisation_sleep.pdf"
 PDF_FILENAME_2 = "visualisation_data.pdf"
 
+# CSVs at least this large are uploaded resumably; smaller ones in one request
+RESUMABLE_UPLOAD_MIN_BYTES = 5 * 1024 * 1024
+
+# Chunk size for resumable CSV uploads (must be a multiple of 256 KB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+
+# CSVs at least this large are parsed with the multithreaded pyarrow engine;
+# smaller ones use the C engine to avoid pyarrow's fixed start-up cost
+PYARROW_CSV_MIN_BYTES = 256 * 1024
+
 # ============================================================================
 # AUTHENTICATION & AUTHORIZATION
 # ============================================================================
 
+class PooledHttp:
+    """
+    Authorized HTTP transport backed by a pool of persistent connections shared
+    by all threads.
+    
+    httplib2 connections are not thread-safe, so each request checks an
+    `httplib2.Http` out of the pool for its duration and returns it afterwards.
+    Streamlit runs every rerun on a fresh thread, so pooling across threads
+    (rather than per thread) is what lets keep-alive connections, and their
+    TCP/TLS handshakes, be reused from one interaction to the next.
+    """
+    
+    def __init__(self, credentials, timeout=30, max_idle=8):
+        self.credentials = credentials
+        self.timeout = timeout
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+    
+    def _new_http(self):
+        # build_http stops httplib2 treating 308 as a redirect, which resumable
+        # uploads rely on
+        http = build_http()
+        http.timeout = self.timeout
+        return AuthorizedHttp(self.credentials, http=http)
+    
+    def request(self, *args, **kwargs):
+        try:
+            http = self._idle.get_nowait()
+        except queue.Empty:
+            http = self._new_http()
+        try:
+            return http.request(*args, **kwargs)
+        finally:
+            try:
+                self._idle.put_nowait(http)
+            except queue.Full:
+                pass
+
+
+@st.cache_resource(ttl=600)  # Cache for 10 minutes
+def get_google_drive_credentials():
+    """
+    Load the Google Drive Service Account credentials from Streamlit secrets.
+    Shared by the Drive API service and the streaming download session.
+    """
+    credentials_dict = st.secrets["google_service_account"]
+    return service_account.Credentials.from_service_account_info(
+        credentials_dict,
+        scopes=['https://www.googleapis.com/auth/drive']
+    )
+
+
 @st.cache_resource(ttl=600)  # Cache for 10 minutes
 def get_google_drive_service():
     """
@@ -49,20 +117,41 @@ def get_google_drive_service():
     Credentials are loaded from Streamlit secrets.
     """
     try:
-        # Load service account credentials from Streamlit secrets
-        credentials_dict = st.secrets["google_service_account"]
-        credentials = service_account.Credentials.from_service_account_info(
-            credentials_dict,
-            scopes=['https://www.googleapis.com/auth/drive']
-        )
-        
-        service = build('drive', 'v3', credentials=credentials)
+        credentials = get_google_drive_credentials()
+        # Use the discovery document bundled with google-api-python-client
+        # rather than downloading it on every cold start
+        service = build('drive', 'v3', http=PooledHttp(credentials), static_discovery=True)
         return service
     except Exception as e:
         st.error(f"Failed to initialize Google Drive service: {str(e)}")
         return None
 
 
+@st.cache_resource(ttl=600)  # Cache for 10 minutes
+def get_google_drive_session():
+    """
+    Initialize and return an authorized requests session for streaming file
+    contents out of Google Drive. The session's urllib3 pool is thread-safe, so
+    a single instance is shared by all Streamlit sessions.
+    """
+    try:
+        session = AuthorizedSession(get_google_drive_credentials())
+        session.mount('https://', HTTPAdapter(pool_connections=8, pool_maxsize=8))
+        return session
+    except Exception as e:
+        st.error(f"Failed to initialize Google Drive session: {str(e)}")
+        return None
+
+
+@st.cache_resource
+def get_drive_executor():
+    """
+    Return the thread pool shared by all sessions for running independent
+    Google Drive requests concurrently.
+    """
+    return ThreadPoolExecutor(max_workers=4)
+
+
 @st.cache_resource(ttl=600)  # Cache for 10 minutes
 def get_google_sheets_service():
     """
@@ -75,7 +164,9 @@ def get_google_sheets_service():
             scopes=['https://www.googleapis.com/auth/spreadsheets.readonly']
         )
         
-        service = build('sheets', 'v4', credentials=credentials)
+        # Built lazily by get_authorized_users on a cache miss, from the bundled
+        # discovery document so no extra round-trip is made
+        service = build('sheets', 'v4', credentials=credentials, static_discovery=True)
         return service
     except Exception as e:
         st.error(f"Failed to initialize Google Sheets service: {str(e)}")
@@ -85,13 +176,14 @@ def get_google_sheets_service():
 @st.cache_data(ttl=300)  # Cache for 5 minutes
 def get_authorized_users():
     """
-    Fetch the list of authorized user emails from the Google Sheet allowlist.
-    Returns a list of email addresses (lowercase for case-insensitive comparison).
+    Fetch the set of authorized user emails from the Google Sheet allowlist.
+    Returns a frozenset of email addresses (lowercase for case-insensitive
+    comparison), so each membership check is O(1).
     """
     try:
         sheets_service = get_google_sheets_service()
         if not sheets_service:
-            return []
+            return frozenset()
         
         spreadsheet_id = st.secrets.get("allowlist_sheet_id", "")
         range_name = st.secrets.get("allowlist_range", "Sheet1!A:A")
@@ -103,33 +195,45 @@ def get_authorized_users():
         
         values = result.get('values', [])
         # Flatten list and convert to lowercase, skip empty rows
-        emails = [row[0].strip().lower() for row in values if row and row[0].strip()]
-        return emails
+        return frozenset(row[0].strip().lower() for row in values if row and row[0].strip())
     except Exception as e:
         st.error(f"Failed to fetch authorized users: {str(e)}")
-        return []
+        return frozenset()
 
 
 def check_user_authorization(user_email):
     """
     Check if the provided user email is in the authorized users list.
     """
-    authorized_users = get_authorized_users()
-    return user_email.lower() in authorized_users
+    return user_email.strip().lower() in get_authorized_users()
 
 
 # ============================================================================
 # GOOGLE DRIVE OPERATIONS
 # ============================================================================
 
-def find_folder_by_path(service, root_folder_id, path_components):
+def escape_query_value(value):
+    """
+    Escape a value for use inside a single-quoted Drive query string literal.
+    
+    Backslashes and single quotes must be escaped, otherwise a participant ID
+    such as "O'Neil" produces an invalid query that Drive rejects.
+    """
+    return value.replace('\\', '\\\\').replace("'", "\\'")
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def find_folder_by_path(_service, root_folder_id, path_components):
     """
     Navigate through Google Drive folder hierarchy to find a folder.
     
+    Results are cached per (root_folder_id, path_components); the leading
+    underscore keeps Streamlit from hashing the service instance.
+    
     Args:
-        service: Google Drive API service instance
+        _service: Google Drive API service instance
         root_folder_id: ID of the root folder to start searching from
-        path_components: List of folder names representing the path
+        path_components: Tuple of folder names representing the path
     
     Returns:
         Folder ID if found, None otherwise
@@ -137,13 +241,13 @@ def find_folder_by_path(service, root_folder_id, path_components):
     current_folder_id = root_folder_id
     
     for folder_name in path_components:
-        query = f"name='{folder_name}' and '{current_folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
+        query = f"name='{escape_query_value(folder_name)}' and '{escape_query_value(current_folder_id)}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
         
         try:
-            results = service.files().list(
+            results = _service.files().list(
                 q=query,
-                fields="files(id, name)",
-                pageSize=10
+                fields="files(id)",
+                pageSize=1
             ).execute()
             
             files = results.get('files', [])
@@ -151,7 +255,7 @@ def find_folder_by_path(service, root_folder_id, path_components):
             if not files:
                 return None
             
-            # Take the first matching folder
+            # Only the first matching folder is used, so only one is requested
             current_folder_id = files[0]['id']
         except Exception as e:
             st.error(f"Error navigating to folder '{folder_name}': {str(e)}")
@@ -160,63 +264,122 @@ def find_folder_by_path(service, root_folder_id, path_components):
     return current_folder_id
 
 
-def find_file_in_folder(service, folder_id, filename):
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
+def find_files_in_folder(_service, folder_id, filenames):
     """
-    Find a specific file in a Google Drive folder.
+    Find several files in a Google Drive folder with a single request.
+    
+    All names are OR-ed into one `files().list` query. If Drive rejects the
+    combined query as invalid (HTTP 400), the per-file queries are sent together
+    as one batch request. Any other error is raised to the caller. Results are
+    cached per (folder_id, filenames).
     
     Args:
-        service: Google Drive API service instance
+        _service: Google Drive API service instance
         folder_id: ID of the folder to search in
-        filename: Name of the file to find
+        filenames: Tuple of names of the files to find
     
     Returns:
-        Dict with file information (id, name, webViewLink) if found, None otherwise
+        Dict mapping each filename to its file information, or None if not found
     """
-    query = f"name='{filename}' and '{folder_id}' in parents and trashed=false"
+    found = {filename: None for filename in filenames}
+    name_clause = " or ".join(f"name='{escape_query_value(filename)}'" for filename in filenames)
+    query = f"'{escape_query_value(folder_id)}' in parents and trashed=false and ({name_clause})"
     
     try:
-        results = service.files().list(
+        results = _service.files().list(
             q=query,
-            fields="files(id, name, webViewLink, webContentLink)",
+            fields="files(id, name, webViewLink)",
             pageSize=10
         ).execute()
         
-        files = results.get('files', [])
-        
+        # Keep the first match for each name, as the single-file lookup did
+        for file in results.get('files', []):
+            if found.get(file['name']) is None:
+                found[file['name']] = file
+        return found
+    except HttpError as e:
+        # Only a rejected combined query is worth retrying per file; auth,
+        # rate-limit and server errors would just multiply the failing calls
+        if e.resp.status != 400:
+            raise
+    
+    def list_request(filename):
+        return _service.files().list(
+            q=f"name='{escape_query_value(filename)}' and '{escape_query_value(folder_id)}' in parents and trashed=false",
+            fields="files(id, name, webViewLink)",
+            pageSize=10
+        )
+    
+    # Fallback: one multipart batch request carrying a query per file
+    def collect(request_id, response, exception):
+        if exception is not None:
+            st.error(f"Error finding file '{request_id}': {str(exception)}")
+            return
+        files = response.get('files', [])
         if files:
-            return files[0]
-        return None
-    except Exception as e:
-        st.error(f"Error finding file '{filename}': {str(e)}")
-        return None
+            found[request_id] = files[0]
+    
+    try:
+        batch = _service.new_batch_http_request(callback=collect)
+        for filename in filenames:
+            batch.add(list_request(filename), request_id=filename)
+        batch.execute()
+        return found
+    except HttpError as e:
+        if e.resp.status != 400:
+            raise
+    
+    # Last resort: run the per-file queries concurrently so their round-trips
+    # overlap. Each request checks its own connection out of PooledHttp.
+    executor = get_drive_executor()
+    futures = {
+        filename: executor.submit(list_request(filename).execute)
+        for filename in filenames
+    }
+    for filename, future in futures.items():
+        try:
+            files = future.result().get('files', [])
+            if files:
+                found[filename] = files[0]
+        except Exception as e:
+            st.error(f"Error finding file '{filename}': {str(e)}")
+    
+    return found
+
+
+def choose_csv_engine(num_bytes):
+    """
+    Pick the pandas CSV engine for a payload of the given size in bytes.
+    
+    Frames keep NumPy dtypes either way, which `st.data_editor` edits cleanly.
+    """
+    return 'pyarrow' if num_bytes >= PYARROW_CSV_MIN_BYTES else 'c'
 
 
-def download_csv_content(service, file_id):
+def stream_csv_from_drive(service, session, file_id):
     """
-    Download the content of a CSV file from Google Drive.
+    Stream a CSV file from Google Drive straight into a DataFrame.
+    
+    The response body is fed directly to the CSV parser, so the file is never
+    buffered in full alongside the resulting DataFrame. Raises on failure and
+    leaves reporting the error to the caller.
     
     Args:
         service: Google Drive API service instance
+        session: Authorized requests session
         file_id: ID of the file to download
     
     Returns:
-        pandas DataFrame if successful, None otherwise
+        pandas DataFrame
     """
-    try:
-        request = service.files().get_media(fileId=file_id)
-        file_content = io.BytesIO()
-        downloader = MediaIoBaseDownload(file_content, request)
-        
-        done = False
-        while not done:
-            status, done = downloader.next_chunk()
-        
-        file_content.seek(0)
-        df = pd.read_csv(file_content)
-        return df
-    except Exception as e:
-        st.error(f"Error downloading CSV file: {str(e)}")
-        return None
+    request = service.files().get_media(fileId=file_id)
+    with session.get(request.uri, stream=True, timeout=30) as response:
+        response.raise_for_status()
+        # Let urllib3 undo any gzip transfer encoding while streaming
+        response.raw.decode_content = True
+        size = int(response.headers.get('Content-Length', 0))
+        return pd.read_csv(response.raw, engine=choose_csv_engine(size))
 
 
 def get_next_version_number(service, folder_id, base_filename):
@@ -238,32 +401,29 @@ def get_next_version_number(service, folder_id, base_filename):
         name_part = base_filename
         ext = ''
     
-    # Search for files with version pattern
+    # Matches exactly "<name>_v<N>.<ext>" (e.g., "data_v3.csv" -> 3), so names
+    # that merely contain the pattern (e.g., "data_v2_notes.csv") are ignored
+    ext_suffix = re.escape('.' + ext) if ext else ''
+    version_regex = re.compile(rf'^{re.escape(name_part)}_v(\d+){ext_suffix}$')
+    
+    # Search for files with version pattern, highest version first. Natural
+    # ordering sorts "_v10" after "_v9", so the latest version is on the first
+    # small page.
     version_pattern = f"{name_part}_v"
-    query = f"'{folder_id}' in parents and trashed=false and name contains '{version_pattern}'"
+    query = f"'{escape_query_value(folder_id)}' in parents and trashed=false and name contains '{escape_query_value(version_pattern)}'"
     
     try:
         results = service.files().list(
             q=query,
             fields="files(name)",
-            pageSize=100
+            orderBy="name_natural desc",
+            pageSize=10
         ).execute()
         
         files = results.get('files', [])
         
-        max_version = 0
-        for file in files:
-            filename = file['name']
-            # Extract version number (e.g., "data_v3.csv" -> 3)
-            try:
-                if ext:
-                    version_str = filename.replace(name_part + '_v', '').replace('.' + ext, '')
-                else:
-                    version_str = filename.replace(name_part + '_v', '')
-                version_num = int(version_str)
-                max_version = max(max_version, version_num)
-            except ValueError:
-                continue
+        matches = (version_regex.match(file['name']) for file in files)
+        max_version = max((int(match.group(1)) for match in matches if match), default=0)
         
         return max_version + 1
     except Exception as e:
@@ -295,28 +455,37 @@ def upload_versioned_csv(service, folder_id, base_filename, dataframe):
         else:
             new_filename = f"{base_filename}_v{version_num}"
         
-        # Convert DataFrame to CSV
-        csv_buffer = io.StringIO()
-        dataframe.to_csv(csv_buffer, index=False)
-        csv_bytes = io.BytesIO(csv_buffer.getvalue().encode('utf-8'))
-        
         # Upload file
         file_metadata = {
             'name': new_filename,
             'parents': [folder_id]
         }
         
-        media = MediaFileUpload(
-            io.BytesIO(csv_bytes.getvalue()),
-            mimetype='text/csv',
-            resumable=True
-        )
-        
-        file = service.files().create(
-            body=file_metadata,
-            media_body=media,
-            fields='id, name, webViewLink'
-        ).execute()
+        # Convert DataFrame to CSV, encoding straight into the upload buffer.
+        # Small CSVs stay in memory; larger ones spill to an anonymous temporary
+        # file instead of repeatedly growing a buffer on the Python heap.
+        with tempfile.SpooledTemporaryFile(max_size=RESUMABLE_UPLOAD_MIN_BYTES) as csv_buffer:
+            # pandas' writer keeps the original file's formatting (unquoted
+            # strings, "8.0" floats), so versions only differ where edited
+            dataframe.to_csv(csv_buffer, index=False, encoding='utf-8')
+            csv_size = csv_buffer.tell()
+            csv_buffer.seek(0)
+            
+            # Small CSVs go up in a single multipart request; only large ones pay
+            # the extra session-initiation round-trip of a resumable upload
+            resumable = csv_size >= RESUMABLE_UPLOAD_MIN_BYTES
+            media = MediaIoBaseUpload(
+                csv_buffer,
+                mimetype='text/csv',
+                chunksize=UPLOAD_CHUNK_SIZE,
+                resumable=resumable
+            )
+            
+            file = service.files().create(
+                body=file_metadata,
+                media_body=media,
+                fields='id, name, webViewLink'
+            ).execute()
         
         return file
     except Exception as e:
@@ -348,20 +517,28 @@ def main():
     
     with st.sidebar:
         st.header("User Authentication")
-        user_email = st.text_input(
-            "Enter your email address:",
-            placeholder="user@stonybrook.edu"
-        )
+        # A form submits the email once on "Sign in" instead of rerunning
+        # the whole app on every keystroke
+        with st.form("login"):
+            user_email = st.text_input(
+                "Enter your email address:",
+                placeholder="user@stonybrook.edu"
+            )
+            submitted = st.form_submit_button("Sign in")
+        
+        if submitted and user_email:
+            st.session_state['user_email'] = user_email
         
-        if user_email:
-            if check_user_authorization(user_email):
-                st.success(f"✅ Authorized: {user_email}")
-                st.session_state['authorized'] = True
-                st.session_state['user_email'] = user_email
-            else:
-                st.error("❌ Unauthorized: Your email is not on the access list.")
-                st.session_state['authorized'] = False
-                st.stop()
+        # Re-checked on every rerun against the cached allowlist, so removing
+        # someone from the sheet also revokes an already open session
+        signed_in_email = st.session_state.get('user_email')
+        st.session_state['authorized'] = bool(signed_in_email) and check_user_authorization(signed_in_email)
+        
+        if st.session_state['authorized']:
+            st.success(f"✅ Authorized: {signed_in_email}")
+        elif signed_in_email:
+            st.error("❌ Unauthorized: Your email is not on the access list.")
+            st.stop()
         else:
             st.info("Please enter your email to access the application.")
             st.stop()
@@ -399,137 +576,203 @@ def main():
     search_button = st.button("🔎 Search Files", type="primary")
     
     if search_button and participant_id:
-        with st.spinner("Searching for files..."):
-            # Initialize Google Drive service
-            drive_service = get_google_drive_service()
-            
-            if not drive_service:
-                st.error("Failed to connect to Google Drive. Please check your configuration.")
-                st.stop()
-            
-            # Get root folder ID from secrets
-            root_folder_id = st.secrets.get("root_folder_id", "")
-            
-            if not root_folder_id:
-                st.error("Root folder ID not configured. Please contact the administrator.")
-                st.stop()
-            
-            # Construct path: accelerometer_name/participant_ID/output_participant_ID/results/
-            path_components = [
-                selected_accelerometer,
-                participant_id,
-                f"output_{participant_id}",
-                "results"
-            ]
-            
-            # Find the target folder
-            target_folder_id = find_folder_by_path(drive_service, root_folder_id, path_components)
-            
-            if not target_folder_id:
-                st.error(f"❌ Could not find folder for {selected_accelerometer}/{participant_id}")
-                st.info("Please verify the accelerometer type and participant ID are correct.")
-                st.stop()
-            
-            st.success(f"✅ Found participant folder!")
-            
-            # Store in session state
-            st.session_state['target_folder_id'] = target_folder_id
-            st.session_state['participant_id'] = participant_id
-            st.session_state['accelerometer'] = selected_accelerometer
-            
-            # Find the three files
-            csv_file = find_file_in_folder(drive_service, target_folder_id, CSV_FILENAME)
-            pdf_file_1 = find_file_in_folder(drive_service, target_folder_id, PDF_FILENAME_1)
-            pdf_file_2 = find_file_in_folder(drive_service, target_folder_id, PDF_FILENAME_2)
-            
-            st.markdown("---")
-            st.header("📂 Participant Files")
-            
-            # Display PDF links
-            st.subheader("📄 View Reports (Read-Only)")
-            
-            col_pdf1, col_pdf2 = st.columns(2)
-            
-            with col_pdf1:
-                if pdf_file_1:
-                    st.markdown(f"**{PDF_FILENAME_1}**")
-                    st.markdown(f"[🔗 Open PDF]({pdf_file_1.get('webViewLink', '')})")
-                else:
-                    st.warning(f"⚠️ {PDF_FILENAME_1} not found")
-            
-            with col_pdf2:
-                if pdf_file_2:
-                    st.markdown(f"**{PDF_FILENAME_2}**")
-                    st.markdown(f"[🔗 Open PDF]({pdf_file_2.get('webViewLink', '')})")
-                else:
-                    st.warning(f"⚠️ {PDF_FILENAME_2} not found")
-            
-            st.markdown("---")
-            
-            # Display editable CSV
-            st.subheader("✏️ Edit Data File")
-            
-            if csv_file:
-                st.markdown(f"**{CSV_FILENAME}**")
+        resolved_key = f"resolved::{selected_accelerometer}::{participant_id}"
+        
+        # Forget the previous participant's lookups and data when switching
+        if st.session_state.get('resolved_key') != resolved_key:
+            stale_keys = [key for key in st.session_state if str(key).startswith('resolved::')]
+            for key in stale_keys + ['original_df', 'last_saved_df']:
+                if key in st.session_state:
+                    del st.session_state[key]
+        
+        # Reruns for the same participant reuse the resolved IDs and links
+        # instead of walking the Drive folder hierarchy again. An entry with a
+        # missing file is looked up afresh, so a file uploaded since shows up.
+        resolved_entry = st.session_state.get(resolved_key)
+        if resolved_entry is None or None in resolved_entry.values():
+            with st.spinner("Searching for files..."):
+                # Initialize Google Drive service
+                drive_service = get_google_drive_service()
                 
-                # Download and display CSV
-                df = download_csv_content(drive_service, csv_file['id'])
+                if not drive_service:
+                    st.error("Failed to connect to Google Drive. Please check your configuration.")
+                    st.stop()
                 
-                if df is not None:
-                    st.info(f"📊 Loaded {len(df)} rows × {len(df.columns)} columns")
-                    
-                    # Store original data in session state
-                    st.session_state['original_df'] = df
-                    st.session_state['csv_file_id'] = csv_file['id']
-                    
-                    # Editable data editor
-                    edited_df = st.data_editor(
-                        df,
-                        use_container_width=True,
-                        num_rows="dynamic",
-                        key="data_editor"
-                    )
-                    
-                    # Save button
-                    col_save, col_info = st.columns([1, 3])
-                    
-                    with col_save:
-                        save_button = st.button("💾 Save Changes", type="primary")
-                    
-                    with col_info:
-                        st.info("💡 Saving will create a new versioned file (e.g., *_v1.csv)")
-                    
-                    if save_button:
-                        with st.spinner("Saving new version..."):
-                            # Upload versioned file
-                            new_file = upload_versioned_csv(
-                                drive_service,
-                                target_folder_id,
-                                CSV_FILENAME,
-                                edited_df
-                            )
-                            
-                            if new_file:
-                                st.success(f"✅ Successfully saved as: **{new_file['name']}**")
-                                st.markdown(f"[🔗 View file]({new_file.get('webViewLink', '')})")
-                                
-                                # Log the save action
-                                st.info(f"""
-                                **Save Details:**
-                                - User: {st.session_state.get('user_email', 'Unknown')}
-                                - Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-                                - Participant: {participant_id}
-                                - Accelerometer: {selected_accelerometer}
-                                """)
-                            else:
-                                st.error("❌ Failed to save the file. Please try again.")
-                else:
-                    st.error("❌ Failed to load CSV file content.")
-            else:
-                st.warning(f"⚠️ {CSV_FILENAME} not found in the participant folder.")
+                # Get root folder ID from secrets
+                root_folder_id = st.secrets.get("root_folder_id", "")
+                
+                if not root_folder_id:
+                    st.error("Root folder ID not configured. Please contact the administrator.")
+                    st.stop()
+                
+                # Construct path: accelerometer_name/participant_ID/output_participant_ID/results/
+                path_components = (
+                    selected_accelerometer,
+                    participant_id,
+                    f"output_{participant_id}",
+                    "results"
+                )
+                
+                # Find the target folder
+                target_folder_id = find_folder_by_path(drive_service, root_folder_id, path_components)
+                
+                if not target_folder_id:
+                    # Don't let a miss stick in the cache; the folder may be added later.
+                    # Only this lookup is dropped, other participants' stay cached.
+                    find_folder_by_path.clear(drive_service, root_folder_id, path_components)
+                    st.error(f"❌ Could not find folder for {selected_accelerometer}/{participant_id}")
+                    st.info("Please verify the accelerometer type and participant ID are correct.")
+                    st.stop()
+                
+                # Find the three files in a single request. Auth, rate-limit and
+                # network failures (timeouts, resets) surface here.
+                filenames = (CSV_FILENAME, PDF_FILENAME_1, PDF_FILENAME_2)
+                try:
+                    files = find_files_in_folder(drive_service, target_folder_id, filenames)
+                except Exception as e:
+                    st.error(f"Error finding files: {str(e)}")
+                    st.stop()
+                csv_file = files[CSV_FILENAME]
+                pdf_file_1 = files[PDF_FILENAME_1]
+                pdf_file_2 = files[PDF_FILENAME_2]
+                
+                if None in files.values():
+                    find_files_in_folder.clear(drive_service, target_folder_id, filenames)
+                
+                st.session_state[resolved_key] = {
+                    'target_folder_id': target_folder_id,
+                    'csv_file_id': csv_file['id'] if csv_file else None,
+                    'pdf1_link': pdf_file_1.get('webViewLink', '') if pdf_file_1 else None,
+                    'pdf2_link': pdf_file_2.get('webViewLink', '') if pdf_file_2 else None
+                }
+        
+        st.success(f"✅ Found participant folder!")
+        
+        # Store in session state
+        st.session_state['resolved_key'] = resolved_key
+        st.session_state['participant_id'] = participant_id
+        st.session_state['accelerometer'] = selected_accelerometer
     
     elif search_button:
         st.warning("⚠️ Please enter a Participant ID.")
+    
+    # Display files for the last participant found, across reruns
+    resolved_key = st.session_state.get('resolved_key')
+    resolved = st.session_state.get(resolved_key) if resolved_key else None
+    if not resolved:
+        return
+    
+    participant_id = st.session_state['participant_id']
+    selected_accelerometer = st.session_state['accelerometer']
+    target_folder_id = resolved['target_folder_id']
+    
+    st.markdown("---")
+    st.header("📂 Participant Files")
+    
+    # Display PDF links
+    st.subheader("📄 View Reports (Read-Only)")
+    
+    col_pdf1, col_pdf2 = st.columns(2)
+    
+    with col_pdf1:
+        if resolved['pdf1_link'] is not None:
+            st.markdown(f"**{PDF_FILENAME_1}**")
+            st.markdown(f"[🔗 Open PDF]({resolved['pdf1_link']})")
+        else:
+            st.warning(f"⚠️ {PDF_FILENAME_1} not found")
+    
+    with col_pdf2:
+        if resolved['pdf2_link'] is not None:
+            st.markdown(f"**{PDF_FILENAME_2}**")
+            st.markdown(f"[🔗 Open PDF]({resolved['pdf2_link']})")
+        else:
+            st.warning(f"⚠️ {PDF_FILENAME_2} not found")
+    
+    st.markdown("---")
+    
+    # Display editable CSV
+    st.subheader("✏️ Edit Data File")
+    
+    if not resolved['csv_file_id']:
+        st.warning(f"⚠️ {CSV_FILENAME} not found in the participant folder.")
+        return
+    
+    st.markdown(f"**{CSV_FILENAME}**")
+    
+    drive_service = get_google_drive_service()
+    
+    if not drive_service:
+        st.error("Failed to connect to Google Drive. Please check your configuration.")
+        st.stop()
+    
+    # Download the CSV once per participant; later reruns reuse the stored copy
+    if 'original_df' not in st.session_state:
+        with st.spinner("Loading CSV data from Google Drive..."):
+            df = None
+            drive_session = get_google_drive_session()
+            if drive_session:
+                try:
+                    df = stream_csv_from_drive(drive_service, drive_session, resolved['csv_file_id'])
+                except Exception as e:
+                    st.error(f"Error downloading CSV file: {str(e)}")
+        
+        if df is None:
+            st.error("❌ Failed to load CSV file content.")
+            return
+        
+        st.session_state['original_df'] = df
+    
+    df = st.session_state['original_df']
+    st.info(f"📊 Loaded {len(df)} rows × {len(df.columns)} columns")
+    
+    # Editable data editor
+    edited_df = st.data_editor(
+        df,
+        use_container_width=True,
+        num_rows="dynamic",
+        key="data_editor"
+    )
+    
+    # Save button
+    col_save, col_info = st.columns([1, 3])
+    
+    with col_save:
+        save_button = st.button("💾 Save Changes", type="primary")
+    
+    with col_info:
+        st.info("💡 Saving will create a new versioned file (e.g., *_v1.csv)")
+    
+    if save_button:
+        # Skip the upload entirely when nothing differs from the last saved data
+        # st.data_editor round-trips values exactly, so any difference is a real edit
+        if edited_df.equals(st.session_state.get('last_saved_df', df)):
+            st.info("ℹ️ No changes to save; skipping upload.")
+        else:
+            with st.spinner("Saving new version..."):
+                # Upload versioned file; the folder ID comes from the resolved
+                # lookup, so saving costs no further Drive searches
+                new_file = upload_versioned_csv(
+                    drive_service,
+                    target_folder_id,
+                    CSV_FILENAME,
+                    edited_df
+                )
+                
+                if new_file:
+                    st.session_state['last_saved_df'] = edited_df
+                    st.success(f"✅ Successfully saved as: **{new_file['name']}**")
+                    st.markdown(f"[🔗 View file]({new_file.get('webViewLink', '')})")
+                
+                    # Log the save action
+                    st.info(f"""
+                    **Save Details:**
+                    - User: {st.session_state.get('user_email', 'Unknown')}
+                    - Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
+                    - Participant: {participant_id}
+                    - Accelerometer: {selected_accelerometer}
+                    """)
+                else:
+                    st.error("❌ Failed to save the file. Please try again.")
 
 
 # ============================================================================
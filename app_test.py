@@ -5,8 +5,13 @@ This version simulates Google Drive responses without making actual API calls.
 
 import streamlit as st
 import pandas as pd
+import pyarrow as pa
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+import math
+import os
 import time
+import uuid
 
 # ============================================================================
 # CONFIGURATION
@@ -26,6 +31,29 @@ CSV_FILENAME = "part4_nightsummary_sleep_cleaned.csv"
 PDF_FILENAME_1 = "visualisation_sleep.pdf"
 PDF_FILENAME_2 = "visualisation_data.pdf"
 
+# CSVs at least this large are parsed with the multithreaded pyarrow engine;
+# smaller ones use the C engine to avoid pyarrow's fixed start-up cost
+PYARROW_CSV_MIN_BYTES = 256 * 1024
+
+# Frames with more rows than this are edited one page at a time
+EDITOR_PAGE_SIZE = 200
+
+# Session state tied to the loaded participant, cleared on a new search
+PARTICIPANT_KEYS = frozenset([
+    'original_df', 'current_df', 'data_token', 'current_unsaved', 'save_count',
+    'editor_key_counter', 'editor_pending_df', 'editor_seed_df', 'editor_seed_page',
+    'editor_pending_dirty', 'editor_seed_dirty',
+    'editor_page', 'original_table', 'save_future', 'pending_save', 'last_save_error',
+    'last_saved_version', 'last_saved_path', 'last_save_timestamp',
+    'last_save_version_num', 'last_save_records_changed'
+])
+
+# Size of each chunk read while downloading the CSV
+DOWNLOAD_CHUNK_BYTES = 256 * 1024
+
+# Set UI_TEST_SIMULATE_LATENCY=1 to add artificial Drive delays to the mock calls
+SIMULATE = os.getenv("UI_TEST_SIMULATE_LATENCY", "0") == "1"
+
 # Mock authorized users for UI testing
 MOCK_AUTHORIZED_USERS = [
     "user@stonybrook.edu",
@@ -42,8 +70,24 @@ def mock_check_authorization(email):
     return email.lower() in [u.lower() for u in MOCK_AUTHORIZED_USERS]
 
 
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+def is_authorized(email):
+    """Cached authorization check, so reruns for the same email skip the lookup."""
+    return mock_check_authorization(email)
+
+
+def looks_like_email(email):
+    """Whether the input is complete enough to be worth an authorization lookup."""
+    return len(email) > 5 and '@' in email
+
+
+@st.cache_data(ttl=600, show_spinner=False)  # Cache for 10 minutes
 def mock_find_files(accelerometer, participant_id):
     """Mock file finding - simulates successful file discovery with real Google Drive links."""
+    # Simulate the Drive lookup delay; cached repeat searches skip it
+    if SIMULATE:
+        time.sleep(0.5)
+    
     return {
         'csv': {
             'id': '1aIEB84p1YY4sCe5RqH--pu6PoU8uUG5v',
@@ -63,24 +107,120 @@ def mock_find_files(accelerometer, participant_id):
     }
 
 
+def choose_csv_engine(num_bytes):
+    """Pick the pandas CSV engine for a payload of the given size in bytes."""
+    return 'pyarrow' if num_bytes >= PYARROW_CSV_MIN_BYTES else 'c'
+
+
+@st.cache_resource
+def get_http_session():
+    """
+    Return a requests session shared across reruns and sessions, so CSV
+    downloads reuse pooled keep-alive connections to Google Drive.
+    """
+    import requests
+    
+    return requests.Session()
+
+
 def mock_load_csv():
-    """Load CSV data from actual Google Drive file."""
+    """Load CSV data from actual Google Drive file. Raises if the download fails."""
     import io
-    import requests
     
     # Convert Google Drive view link to direct download link
     file_id = '1aIEB84p1YY4sCe5RqH--pu6PoU8uUG5v'
     download_url = f'https://drive.google.com/uc?export=download&id={file_id}'
     
+    progress = st.progress(0.0, text="Downloading CSV...")
+    
     try:
-        # Download the CSV file
-        response = requests.get(download_url)
-        response.raise_for_status()
+        # Download the CSV file in chunks, reporting progress as it arrives
+        csv_content = io.BytesIO()
+        with get_http_session().get(download_url, stream=True, timeout=30) as response:
+            response.raise_for_status()
+            total_bytes = int(response.headers.get('Content-Length', 0))
+            
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
+                csv_content.write(chunk)
+                loaded_bytes = csv_content.tell()
+                fraction = min(1.0, loaded_bytes / total_bytes) if total_bytes else 0.0
+                progress.progress(fraction, text=f"Downloading CSV... {loaded_bytes / 1e6:.1f} MB")
         
         # Load into pandas DataFrame
-        csv_content = io.StringIO(response.text)
-        df = pd.read_csv(csv_content)
+        size = csv_content.tell()
+        csv_content.seek(0)
+        df = pd.read_csv(csv_content, engine=choose_csv_engine(size))
         return df
+    finally:
+        progress.empty()
+
+
+def editor_has_edits(editor_key):
+    """
+    Whether a data editor holds any edits, read in O(1) from its widget state
+    (the edited, added and deleted rows it reports) instead of comparing frames.
+    """
+    state = st.session_state.get(editor_key) or {}
+    return bool(state.get('edited_rows') or state.get('added_rows') or state.get('deleted_rows'))
+
+
+def count_changed_records(edited_df, original_df):
+    """
+    Count rows that differ between two versions of the data: rows modified,
+    added, or removed.
+    
+    Rows are matched on their index labels, which st.data_editor keeps for
+    every row it does not delete, so deleting one row counts as one change
+    rather than shifting every row after it.
+    
+    Args:
+        edited_df: DataFrame after editing
+        original_df: DataFrame as originally loaded
+        
+    Returns:
+        int: Number of changed records
+    """
+    if set(edited_df.columns) != set(original_df.columns):
+        return max(len(edited_df), len(original_df))
+    
+    common = edited_df.index.intersection(original_df.index)
+    left = edited_df.loc[common]
+    right = original_df.loc[common, edited_df.columns]
+    
+    # Cells that are missing on both sides count as unchanged
+    differs = left.ne(right) & ~(left.isna() & right.isna())
+    modified = int(differs.any(axis=1).sum())
+    
+    added = len(edited_df.index.difference(original_df.index))
+    removed = len(original_df.index.difference(edited_df.index))
+    return modified + added + removed
+
+
+@st.cache_data(show_spinner=False, max_entries=8)
+def df_to_csv_bytes(_df, edit_state):
+    """
+    Serialize a DataFrame to CSV bytes, reusing the result while it is unchanged.
+    The cache is keyed on edit_state (the loaded data's token plus the editor's
+    key and edits) rather than the frame, which Streamlit's own hasher would
+    hash in full, or only sample for large frames.
+    Uses pandas' writer so the download keeps the original file's formatting.
+    """
+    return _df.to_csv(index=False).encode('utf-8')
+
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+def cached_load_csv(participant_id, accelerometer):
+    """
+    Cached CSV load, keyed per participant so reruns reuse the DataFrame.
+    Failures raise and are therefore never cached.
+    """
+    return mock_load_csv()
+
+
+def load_csv(participant_id, accelerometer):
+    """Load the participant's CSV, falling back to mock data if the download fails."""
+    try:
+        return cached_load_csv(participant_id, accelerometer)
     except Exception as e:
         # Fallback to mock data if download fails
         st.warning(f"Could not load real CSV data: {str(e)}. Using fallback data.")
@@ -95,10 +235,313 @@ def mock_load_csv():
         })
 
 
+@st.cache_resource
+def get_save_executor():
+    """Thread pool shared by all sessions for running uploads in the background."""
+    return ThreadPoolExecutor(max_workers=4)
+
+
+def mock_upload_csv(dataframe, new_filename, path):
+    """
+    Mock upload of a versioned CSV. Runs on a worker thread, so it must not
+    call Streamlit; returns the details of the saved file.
+    """
+    # Simulate save delay
+    if SIMULATE:
+        time.sleep(1)
+    
+    return {
+        'name': new_filename,
+        'path': f"{path}{new_filename}",
+        'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+    }
+
+
 # ============================================================================
 # STREAMLIT UI
 # ============================================================================
 
+@st.fragment(run_every=1)
+def poll_pending_save():
+    """
+    Check once a second whether the background upload has finished, then
+    record the save and rerun the full app to show it. A failed save marks the
+    edits, still shown in the editor, as unsaved so they can be saved again. A save
+    started for a different participant than the one now loaded is not recorded.
+    """
+    future = st.session_state['save_future']
+    if not future.done():
+        st.info("⏳ Saving changes to Google Drive in the background...")
+        return
+    
+    pending = st.session_state.pop('pending_save')
+    del st.session_state['save_future']
+    
+    current_participant = (st.session_state.get('accelerometer'), st.session_state.get('participant_id'))
+    if pending['participant'] != current_participant:
+        st.rerun()
+    
+    try:
+        saved = future.result()
+    except Exception as e:
+        # The editor keeps showing the edits; mark them unsaved again
+        st.session_state['current_unsaved'] = True
+        st.session_state['save_count'] = pending['previous_save_count']
+        st.session_state['last_save_error'] = str(e)
+        st.rerun()
+    
+    # Store save information in session state
+    st.session_state['last_saved_version'] = saved['name']
+    st.session_state['last_saved_path'] = saved['path']
+    st.session_state['last_save_timestamp'] = saved['timestamp']
+    st.session_state['last_save_version_num'] = pending['version_num']
+    st.session_state['last_save_records_changed'] = pending['records_changed']
+    
+    # Show a persistent success toast
+    st.toast("✅ Changes saved successfully!", icon="✅")
+    if SIMULATE:
+        time.sleep(0.5)
+    st.rerun()
+
+
+def render_data_editor(current_df):
+    """
+    Render the editable data grid.
+    
+    Frames longer than EDITOR_PAGE_SIZE rows are shown one page at a time, so
+    the browser only renders a window of rows. Each page's editor is seeded
+    from the latest edits of all pages when it is opened, and its edits are
+    spliced back into the full frame on every rerun.
+    
+    Returns:
+        tuple: (full edited DataFrame, whether it holds edits, editor widget key)
+    """
+    editor_count = st.session_state.get('editor_key_counter', 0)
+    
+    if len(current_df) <= EDITOR_PAGE_SIZE:
+        editor_key = f"data_editor_{editor_count}"
+        edited_df = st.data_editor(
+            current_df,
+            use_container_width=True,
+            num_rows="dynamic",  # Allow users to add/delete rows
+            height=400,
+            key=editor_key
+        )
+        return edited_df, editor_has_edits(editor_key), editor_key
+    
+    latest_df = st.session_state.get('editor_pending_df', current_df)
+    page_count = max(1, math.ceil(len(latest_df) / EDITOR_PAGE_SIZE))
+    
+    # Keep the current page when added or deleted rows change the page count,
+    # clamped so it never points past the last page
+    st.session_state['editor_page'] = min(st.session_state.get('editor_page', 1), page_count)
+    page = st.number_input(
+        f"Page (of {page_count}, {EDITOR_PAGE_SIZE} rows each)",
+        min_value=1,
+        max_value=page_count,
+        step=1,
+        key="editor_page"
+    )
+    
+    # Entering a page: seed a fresh editor from the latest edits
+    if st.session_state.get('editor_seed_page') != page:
+        st.session_state['editor_seed_df'] = latest_df
+        st.session_state['editor_seed_dirty'] = st.session_state.get('editor_pending_dirty', False)
+        st.session_state['editor_seed_page'] = page
+        st.session_state['editor_key_counter'] = editor_count + 1
+    
+    seed_df = st.session_state['editor_seed_df']
+    start, end = (page - 1) * EDITOR_PAGE_SIZE, page * EDITOR_PAGE_SIZE
+    page_df = seed_df.iloc[start:end]
+    editor_key = f"data_editor_p{page}_{st.session_state['editor_key_counter']}"
+    edited_page = st.data_editor(
+        page_df,
+        use_container_width=True,
+        num_rows="dynamic",  # Allow users to add/delete rows
+        height=400,
+        key=editor_key
+    )
+    
+    # Index labels are kept so edits can be matched to the original rows. Rows
+    # added on this page are labelled from the end of the page, which can clash
+    # with rows on later pages, so relabel them past the end of the whole frame.
+    added = ~edited_page.index.isin(page_df.index)
+    if added.any():
+        next_label = seed_df.index.max() + 1 if len(seed_df) else 0
+        labels = edited_page.index.to_list()
+        for position in added.nonzero()[0]:
+            labels[position] = next_label
+            next_label += 1
+        edited_page = edited_page.set_axis(labels)
+    
+    edited_df = pd.concat([seed_df.iloc[:start], edited_page, seed_df.iloc[end:]])
+    has_edits = st.session_state['editor_seed_dirty'] or editor_has_edits(editor_key)
+    st.session_state['editor_pending_df'] = edited_df
+    st.session_state['editor_pending_dirty'] = has_edits
+    return edited_df, has_edits, editor_key
+
+
+def get_original_table():
+    """
+    Return original_df as an Arrow table, converting it once per load.
+    
+    st.dataframe sends Arrow tables to the browser as they are, so reruns skip
+    converting the unchanged original data from pandas again. Frames that
+    Arrow cannot convert are returned as-is.
+    """
+    if 'original_table' not in st.session_state:
+        original_df = st.session_state['original_df']
+        try:
+            table = pa.Table.from_pandas(original_df, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError):
+            table = original_df
+        st.session_state['original_table'] = table
+    return st.session_state['original_table']
+
+
+@st.fragment
+def render_editor(participant_id, selected_accelerometer, path):
+    """
+    Render the CSV editor with its save, download, and save-status widgets.
+    
+    Runs as a fragment, so editing, downloading, or dismissing a message
+    reruns only this section instead of the whole page.
+    
+    Args:
+        participant_id: Participant whose CSV is being edited
+        selected_accelerometer: Accelerometer type of the participant
+        path: Drive folder path of the participant's results
+    """
+    st.subheader("📊 Edit Data File")
+    st.markdown(f"**{CSV_FILENAME}**")
+    
+    # Initialize session state for data editing
+    if 'original_df' not in st.session_state:
+        with st.spinner("Loading CSV data from Google Drive..."):
+            df = load_csv(participant_id, selected_accelerometer)
+        st.info(f"📊 Loaded {len(df)} rows × {len(df.columns)} columns")
+        # st.cache_data hands back a fresh frame, so it can be owned directly;
+        # the editor never mutates its input, so a shallow copy suffices
+        st.session_state['original_df'] = df
+        st.session_state['current_df'] = df.copy(deep=False)
+        st.session_state['data_token'] = uuid.uuid4().hex
+        st.session_state['current_unsaved'] = False
+        st.session_state['save_count'] = 0
+        st.session_state['last_saved_version'] = None
+    
+    # Editable data editor with dynamic rows
+    st.markdown("**✏️ Edit Data Below** (You can add, delete, or modify rows)")
+    edited_df, has_edits, editor_key = render_data_editor(st.session_state['current_df'])
+    
+    # Check if data was modified, from the editor's own record of edits rather
+    # than by comparing frames; current_unsaved is set when a save failed
+    data_changed = has_edits or st.session_state['current_unsaved']
+    
+    # Save button and status display
+    st.markdown("")  # Add spacing
+    col_save, col_status, col_download = st.columns([1, 2, 1])
+    
+    with col_save:
+        save_button = st.button(
+            "💾 Save Changes", 
+            type="primary", 
+            disabled=not data_changed, 
+            key="save_btn",
+            help="Save edited data as a new versioned file in Google Drive"
+        )
+    
+    with col_status:
+        if data_changed:
+            st.warning("⚠️ You have unsaved changes")
+        else:
+            st.success("✅ All changes saved")
+    
+    with col_download:
+        # Download button for current data
+        st.download_button(
+            label="⬇️ Download",
+            data=df_to_csv_bytes(
+                edited_df,
+                (st.session_state['data_token'], editor_key, st.session_state.get(editor_key))
+            ),
+            file_name=CSV_FILENAME,
+            mime="text/csv",
+            key="download_csv_btn",
+            help="Download current data as CSV file"
+        )
+    
+    # Handle save action with versioning
+    if save_button and data_changed:
+        # Kept so a failed upload can restore the version counter
+        previous_save_count = st.session_state['save_count']
+        
+        # Update current state; st.data_editor returns a fresh frame
+        # each rerun, so it can be kept by reference without a copy
+        st.session_state['current_df'] = edited_df
+        st.session_state['data_token'] = uuid.uuid4().hex
+        st.session_state['current_unsaved'] = False
+        
+        # Start a fresh editor on the saved data, on the same page
+        st.session_state['editor_key_counter'] = st.session_state.get('editor_key_counter', 0) + 1
+        for key in ['editor_pending_df', 'editor_pending_dirty', 'editor_seed_df', 'editor_seed_page']:
+            st.session_state.pop(key, None)
+        
+        # Create versioned filename
+        version_num = st.session_state['save_count'] + 1
+        st.session_state['save_count'] = version_num
+        
+        name_part, ext = CSV_FILENAME.rsplit('.', 1)
+        new_filename = f"{name_part}_v{version_num}.{ext}"
+        
+        # Calculate number of records changed
+        records_changed = count_changed_records(edited_df, st.session_state['original_df'])
+        
+        # Upload in the background so the editor stays usable meanwhile
+        st.session_state['save_future'] = get_save_executor().submit(
+            mock_upload_csv, edited_df, new_filename, path
+        )
+        st.session_state['pending_save'] = {
+            'participant': (selected_accelerometer, participant_id),
+            'version_num': version_num,
+            'records_changed': records_changed,
+            'previous_save_count': previous_save_count
+        }
+        # The save poller lives outside this fragment
+        st.rerun(scope="app")
+    
+    if st.session_state.get('last_save_error'):
+        st.error(f"❌ Failed to save the file: {st.session_state.pop('last_save_error')}")
+    
+    # Display persistent success message if a save has occurred
+    if st.session_state.get('last_saved_version'):
+        st.success(f"✅ **Successfully saved changes!**")
+        st.info(f"📁 New versioned file created: **{st.session_state['last_saved_version']}**")
+        st.markdown(f"Path: `{st.session_state['last_saved_path']}`")
+        
+        # Log the save action
+        with st.expander("📋 Save Details"):
+            st.markdown(f"""
+            - **User**: {st.session_state.get('user_email', 'Unknown')}
+            - **Timestamp**: {st.session_state.get('last_save_timestamp', 'N/A')}
+            - **Participant ID**: {participant_id}
+            - **Accelerometer**: {selected_accelerometer}
+            - **Version Number**: v{st.session_state.get('last_save_version_num', 'N/A')}
+            - **Records Changed**: {st.session_state.get('last_save_records_changed', 0)}
+            - **File Location**: `{st.session_state['last_saved_path']}`
+            """)
+            st.caption("💡 The original file remains unchanged. All edits are saved as new versioned files.")
+        
+        # Dismiss button below save details
+        if st.button("✖️ Dismiss", key="dismiss_success", help="Clear this success message"):
+            # Clear all save-related session state
+            st.session_state['last_saved_version'] = None
+            st.session_state['last_saved_path'] = None
+            st.session_state['last_save_timestamp'] = None
+            st.session_state['last_save_version_num'] = None
+            st.session_state['last_save_records_changed'] = None
+            st.rerun(scope="fragment")
+
+
 def main():
     """
     Main application function - UI testing version.
@@ -120,20 +563,30 @@ def main():
     with st.sidebar:
         st.header("Login")
         
-        user_email = st.text_input(
-            "Enter your email address:",
-            placeholder="user@stonybrook.edu"
-        )
+        # A form submits the email once on "Sign in" instead of rerunning
+        # the whole app on every keystroke
+        with st.form("login"):
+            user_email = st.text_input(
+                "Enter your email address:",
+                placeholder="user@stonybrook.edu"
+            )
+            submitted = st.form_submit_button("Sign in")
+        
+        user_email = user_email.strip().lower()
+        
+        if submitted and looks_like_email(user_email):
+            st.session_state['user_email'] = user_email
         
-        if user_email:
-            if mock_check_authorization(user_email):
-                st.success(f"✅ Login successful: {user_email}")
-                st.session_state['authorized'] = True
-                st.session_state['user_email'] = user_email
-            else:
-                st.error("❌ Unauthorized: Your email is not on the access list.")
-                st.session_state['authorized'] = False
-                st.stop()
+        # Re-checked on every rerun against the cached allowlist, so removing
+        # someone from the list also revokes an already open session
+        signed_in_email = st.session_state.get('user_email')
+        st.session_state['authorized'] = bool(signed_in_email) and is_authorized(signed_in_email)
+        
+        if st.session_state['authorized']:
+            st.success(f"✅ Login successful: {signed_in_email}")
+        elif signed_in_email:
+            st.error("❌ Unauthorized: Your email is not on the access list.")
+            st.stop()
         else:
             st.info("Please enter your email to access the application.")
             st.stop()
@@ -180,14 +633,10 @@ def main():
     if search_button and participant_id and selected_accelerometer != "Select an accelerometer type...":
         # Clear previous session data when searching for new participant
         if st.session_state.get('participant_id') != participant_id:
-            for key in ['original_df', 'current_df', 'last_df', 'save_count', 'pending_delete_confirmation', 'deleted_nights', 'delete_confirmed', 'pending_df', 'editor_key_counter']:
-                if key in st.session_state:
-                    del st.session_state[key]
+            for key in PARTICIPANT_KEYS & st.session_state.keys():
+                del st.session_state[key]
         
         with st.spinner("Searching for files..."):
-            # Simulate search delay
-            time.sleep(0.5)
-            
             # Mock file finding
             files = mock_find_files(selected_accelerometer, participant_id)
             
@@ -229,133 +678,25 @@ def main():
         st.markdown("---")
         
         # Editable CSV Data Section
-        st.subheader("📊 Edit Data File")
-        st.markdown(f"**{CSV_FILENAME}**")
-        
-        # Initialize session state for data editing
-        if 'original_df' not in st.session_state:
-            with st.spinner("Loading CSV data from Google Drive..."):
-                df = mock_load_csv()
-            st.info(f"📊 Loaded {len(df)} rows × {len(df.columns)} columns")
-            st.session_state['original_df'] = df.copy()
-            st.session_state['current_df'] = df.copy()
-            st.session_state['save_count'] = 0
-            st.session_state['last_saved_version'] = None
-        
-        # Editable data editor with dynamic rows
-        st.markdown("**✏️ Edit Data Below** (You can add, delete, or modify rows)")
-        edited_df = st.data_editor(
-            st.session_state['current_df'],
-            use_container_width=True,
-            num_rows="dynamic",  # Allow users to add/delete rows
-            height=400,
-            key="data_editor"
-        )
-        
-        # Check if data was modified
-        data_changed = not edited_df.equals(st.session_state['current_df'])
+        render_editor(participant_id, selected_accelerometer, path)
         
-        # Save button and status display
-        st.markdown("")  # Add spacing
-        col_save, col_status, col_download = st.columns([1, 2, 1])
-        
-        with col_save:
-            save_button = st.button(
-                "💾 Save Changes", 
-                type="primary", 
-                disabled=not data_changed, 
-                key="save_btn",
-                help="Save edited data as a new versioned file in Google Drive"
-            )
-        
-        with col_status:
-            if data_changed:
-                st.warning("⚠️ You have unsaved changes")
-            else:
-                st.success("✅ All changes saved")
-        
-        with col_download:
-            # Download button for current data
-            csv_data = edited_df.to_csv(index=False)
-            st.download_button(
-                label="⬇️ Download",
-                data=csv_data,
-                file_name=CSV_FILENAME,
-                mime="text/csv",
-                key="download_csv_btn",
-                help="Download current data as CSV file"
-            )
-        
-        # Handle save action with versioning
-        if save_button and data_changed:
-            with st.spinner("Saving changes to Google Drive..."):
-                # Simulate save delay
-                time.sleep(1)
-                
-                # Update current state
-                st.session_state['current_df'] = edited_df.copy()
-                
-                # Create versioned filename
-                version_num = st.session_state['save_count'] + 1
-                st.session_state['save_count'] = version_num
-                
-                name_part, ext = CSV_FILENAME.rsplit('.', 1)
-                new_filename = f"{name_part}_v{version_num}.{ext}"
-                
-                # Store save information in session state
-                st.session_state['last_saved_version'] = new_filename
-                st.session_state['last_saved_path'] = f"{path}{new_filename}"
-                st.session_state['last_save_timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                st.session_state['last_save_version_num'] = version_num
-                
-                # Calculate number of records changed
-                records_changed = abs(len(edited_df) - len(st.session_state['original_df']))
-                st.session_state['last_save_records_changed'] = records_changed
-                
-                # Show a persistent success toast
-                st.toast("✅ Changes saved successfully!", icon="✅")
-                time.sleep(0.5)
-                st.rerun()
-        
-        # Display persistent success message if a save has occurred
-        if st.session_state.get('last_saved_version'):
-            st.success(f"✅ **Successfully saved changes!**")
-            st.info(f"📁 New versioned file created: **{st.session_state['last_saved_version']}**")
-            st.markdown(f"Path: `{st.session_state['last_saved_path']}`")
-            
-            # Log the save action
-            with st.expander("📋 Save Details"):
-                st.markdown(f"""
-                - **User**: {st.session_state.get('user_email', 'Unknown')}
-                - **Timestamp**: {st.session_state.get('last_save_timestamp', 'N/A')}
-                - **Participant ID**: {participant_id}
-                - **Accelerometer**: {selected_accelerometer}
-                - **Version Number**: v{st.session_state.get('last_save_version_num', 'N/A')}
-                - **Records Changed**: {st.session_state.get('last_save_records_changed', 0)}
-                - **File Location**: `{st.session_state['last_saved_path']}`
-                """)
-                st.caption("💡 The original file remains unchanged. All edits are saved as new versioned files.")
-            
-            # Dismiss button below save details
-            if st.button("✖️ Dismiss", key="dismiss_success", help="Clear this success message"):
-                # Clear all save-related session state
-                st.session_state['last_saved_version'] = None
-                st.session_state['last_saved_path'] = None
-                st.session_state['last_save_timestamp'] = None
-                st.session_state['last_save_version_num'] = None
-                st.session_state['last_save_records_changed'] = None
-                st.rerun()
+        if st.session_state.get('save_future'):
+            poll_pending_save()
         
         # Show comparison with original data
         if not st.session_state['current_df'].equals(st.session_state['original_df']):
             st.markdown("---")
             with st.expander("📊 Compare with Original Data"):
-                st.markdown("**Original data loaded from Google Drive:**")
-                st.dataframe(
-                    st.session_state['original_df'],
-                    use_container_width=True,
-                    height=300
-                )
+                # The expander body runs even while collapsed, so only send the
+                # full original frame to the browser when asked for
+                if st.checkbox("Show original data comparison"):
+                    st.markdown("**Original data loaded from Google Drive:**")
+                    st.dataframe(
+                        get_original_table(),
+                        use_container_width=True,
+                        height=300,
+                        hide_index=True
+                    )
                 col_info1, col_info2 = st.columns(2)
                 with col_info1:
                     st.metric("Original Rows", len(st.session_state['original_df']))
@@ -367,10 +708,18 @@ def main():
         st.markdown("---")
         if st.button("🔄 Reload from Google Drive", key="refresh_btn", help="Discard all changes and reload original data"):
             with st.spinner("Reloading data from Google Drive..."):
-                df = mock_load_csv()
-            st.session_state['original_df'] = df.copy()
-            st.session_state['current_df'] = df.copy()
+                # Drop the cached copy so the reload really fetches fresh data
+                cached_load_csv.clear()
+                df = load_csv(participant_id, selected_accelerometer)
+            st.session_state['original_df'] = df
+            st.session_state['current_df'] = df.copy(deep=False)
+            st.session_state['data_token'] = uuid.uuid4().hex
+            st.session_state['current_unsaved'] = False
             st.session_state['save_count'] = 0
+            st.session_state['editor_key_counter'] = st.session_state.get('editor_key_counter', 0) + 1
+            # Discard paged edits and the converted original so both are rebuilt from the fresh data
+            for key in ['editor_pending_df', 'editor_pending_dirty', 'editor_seed_df', 'editor_seed_page', 'editor_page', 'original_table']:
+                st.session_state.pop(key, None)
             st.success("✅ Data reloaded from Google Drive!")
             st.rerun()
     